@@ -4,16 +4,16 @@ from __future__ import annotations
 import numpy as np
 import pandas as pd
 import streamlit as st
-import altair as alt
+from dataclasses import asdict
 from datetime import datetime
+from functools import lru_cache
 import math
-import base64
-from pathlib import Path
+import re
+import textwrap
 
 from src import config
 from src.scenario import Scenario
-from src.run_sim import simulate_many, evaluate_grid
-import streamlit.components.v1 as components
+from src.run_sim import simulate_many, evaluate_grid_vec, game_traces, grid_row, top_indices
 
 Q_MIN = config.Q_MIN
 Q_MAX = config.Q_MAX
@@ -28,12 +28,21 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
-def set_bg(image_path: str):
-    img = Path(image_path).read_bytes()
-    encoded = base64.b64encode(img).decode()
+def _minify_css(css: str) -> str:
+    """
+    Strip comments and collapse whitespace in a <style> block. Spaces before ':'
+    are kept since they are descendant combinators in selectors like `a :is(...)`.
+    """
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    return css.strip()
 
-    st.markdown(
-        f"""
+
+# image is served from ./static (server.enableStaticServing) so the browser can cache it
+BG_IMAGE_URL = "app/static/hotdog_1.jpg"
+
+_BG_CSS = f"""
         <style>
 
         /* =========================
@@ -42,7 +51,7 @@ def set_bg(image_path: str):
         [data-testid="stAppViewContainer"] {{
             background:
               linear-gradient(rgba(0,0,0,0.15), rgba(0,0,0,0.35)),
-              url("data:image/jpeg;base64,{encoded}");
+              url("{BG_IMAGE_URL}");
             background-size: cover;
             background-position: center;
             background-attachment: fixed;
@@ -120,25 +129,16 @@ def set_bg(image_path: str):
         }}
 
         </style>
-        """,
-        unsafe_allow_html=True
-    )
-
-
-set_bg("pics/hotdog_1.jpg")
+        """
 
-st.markdown(
-    """
+_HERO_HTML = """
     <div class="hero-title">
         <h1>Hot Dog Newsvendor Simulator</h1>
         <p>Game-day demand & profit simulation for choosing the optimal hot dog order quantity (Q)</p>
     </div>
-    """,
-    unsafe_allow_html=True
-)
-
-st.markdown(
     """
+
+_RIBBON_HTML = """
     <div style="
         margin:14px 0 18px;
         border:1px solid #E0E3EB;
@@ -165,16 +165,13 @@ st.markdown(
         Choose your <span style="color:#D73A2F; font-weight:900;">Q</span> for the current game scenario.
       </div>
     </div>
-    """,
-    unsafe_allow_html=True,
-)
+    """
+
 
 # ============================================================
 # Theme / CSS
 # ============================================================
-def apply_theme_css():
-    st.markdown(
-        """
+_THEME_CSS = """
         <style>
         :root{
             --bg: #FFFFFF;
@@ -213,7 +210,9 @@ def apply_theme_css():
            METRICS
         ========================= */
 
-        div[data-testid="metric-container"], .stMetric{
+        :is(div[data-testid="metric-container"], .stMetric){
+            --mv-align: center;
+
             background: rgba(255,255,255,0.92) !important;
             border: 1px solid rgba(224,227,235,0.9) !important;
             border-radius: 14px !important;
@@ -222,58 +221,54 @@ def apply_theme_css():
 
             display: flex !important;
             flex-direction: column !important;
-            align-items: center !important;
+            align-items: var(--mv-align) !important;
             justify-content: center !important;
 
-            text-align: center !important;
+            text-align: var(--mv-align) !important;
         }
 
-        div[data-testid="metric-container"] > div,
-        .stMetric > div{
+        :is(div[data-testid="metric-container"], .stMetric) > div{
             width: 100% !important;
             display: flex !important;
             flex-direction: column !important;
-            align-items: center !important;
+            align-items: var(--mv-align) !important;
             justify-content: center !important;
-            text-align: center !important;
+            text-align: var(--mv-align) !important;
         }
 
-        /* Label */
-        div[data-testid="metric-container"] [data-testid="stMetricLabel"],
-        div[data-testid="metric-container"] [data-testid="stMetricLabel"] *,
-        .stMetric [data-testid="stMetricLabel"],
-        .stMetric [data-testid="stMetricLabel"] *{
+        /* Label + value (and their children) */
+        :is(div[data-testid="metric-container"], .stMetric)
+          :is([data-testid="stMetricLabel"], [data-testid="stMetricValue"]),
+        :is(div[data-testid="metric-container"], .stMetric)
+          :is([data-testid="stMetricLabel"], [data-testid="stMetricValue"]) *{
             width: 100% !important;
             display: block !important;
-            text-align: center !important;
+            text-align: var(--mv-align) !important;
+        }
+
+        :is(div[data-testid="metric-container"], .stMetric) [data-testid="stMetricLabel"],
+        :is(div[data-testid="metric-container"], .stMetric) [data-testid="stMetricLabel"] *{
             font-weight: 800 !important;
             color: var(--muted) !important;
         }
 
-        /* Value */
-        div[data-testid="metric-container"] [data-testid="stMetricValue"],
-        div[data-testid="metric-container"] [data-testid="stMetricValue"] *,
-        .stMetric [data-testid="stMetricValue"],
-        .stMetric [data-testid="stMetricValue"] *{
-            width: 100% !important;
-            display: block !important;
-            text-align: center !important;
+        :is(div[data-testid="metric-container"], .stMetric) [data-testid="stMetricValue"],
+        :is(div[data-testid="metric-container"], .stMetric) [data-testid="stMetricValue"] *{
             font-weight: 950 !important;
             color: var(--text) !important;
         }
 
         /* Delta (if any) */
-        div[data-testid="metric-container"] [data-testid="stMetricDelta"],
-        .stMetric [data-testid="stMetricDelta"]{
+        :is(div[data-testid="metric-container"], .stMetric) [data-testid="stMetricDelta"]{
             width: 100% !important;
-            text-align: center !important;
+            text-align: var(--mv-align) !important;
             justify-content: center !important;
         }
 
         /* =========================
            Buttons
         ========================= */
-        div.stButton > button[kind="primary"]{
+        :is(div.stButton, div.stFormSubmitButton) > button:is([kind="primary"], [kind="primaryFormSubmit"]){
             background: var(--ketchup) !important;
             color: #FFFFFF !important;
             border: 1px solid var(--ketchup) !important;
@@ -281,7 +276,7 @@ def apply_theme_css():
             padding: 0.60rem 1.15rem !important;
             font-weight: 800 !important;
         }
-        div.stButton > button[kind="primary"]:hover{
+        :is(div.stButton, div.stFormSubmitButton) > button:is([kind="primary"], [kind="primaryFormSubmit"]):hover{
             background: var(--ketchupDark) !important;
             border-color: var(--ketchupDark) !important;
         }
@@ -291,12 +286,16 @@ def apply_theme_css():
             box-shadow: none !important;
         }
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
 
 
-apply_theme_css()
+# one injection for all static chrome (each piece dedented so markdown keeps it as raw HTML)
+_STATIC_CHROME_HTML = "\n".join(
+    textwrap.dedent(part)
+    for part in (_minify_css(_BG_CSS), _minify_css(_THEME_CSS), _HERO_HTML, _RIBBON_HTML)
+)
+
+st.markdown(_STATIC_CHROME_HTML, unsafe_allow_html=True)
 
 # ============================================================
 # Altair Theme
@@ -309,7 +308,7 @@ BORDER  = "#E0E3EB"
 PANEL   = "#FFFFFF"
 
 
-def register_altair_theme():
+def register_altair_theme(alt):
     def _theme():
         return {
             "config": {
@@ -359,7 +358,17 @@ def register_altair_theme():
     alt.themes.enable("hotdog_theme")
 
 
-register_altair_theme()
+@st.cache_resource(show_spinner=False)
+def _altair():
+    """
+    Import altair on the first chart and register the theme with it.
+    Once per process: altair keeps the theme registry at module level
+    (a plain global flag would be reset by every script rerun).
+    """
+    import altair as alt
+
+    register_altair_theme(alt)
+    return alt
 
 # ============================================================
 # Helpers / constants
@@ -400,11 +409,48 @@ def handle_indoor_toggle():
         st.session_state["temp_f"] = IDEAL_TEMP_F
 
 
+# Runs are cached on plain values (Scenario -> asdict), so pressing Run again with
+# the same inputs, or flipping back to an earlier setup, skips the simulation.
+# session_state.last_run only keeps these arguments; the Results tab fetches the
+# payload back from the cache (recomputing it deterministically if evicted).
+@st.cache_data(show_spinner=False, max_entries=32)
+def run_single(sc_dict: dict, Q: int) -> dict:
+    """Single-Q run: simulate_many summary with traces."""
+    sc = Scenario(**sc_dict)
+    return simulate_many(Q=Q, sc=sc, return_traces=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def run_grid(sc_dict: dict, Qmin: int, Qmax: int, step: int) -> dict:
+    """Grid run: columnar grid summaries, top-10 row indices, and traces for the best Q and the runner-up."""
+    sc = Scenario(**sc_dict)
+    Q_values = np.arange(Qmin, Qmax + 1, step, dtype=np.int32)
+    results = evaluate_grid_vec(Q_values, sc=sc)
+
+    top_idx = top_indices(results["avg_profit"], 10)
+    best = grid_row(results, top_idx[0])
+    # the grid rows already hold the summaries; traces come from the grid's own demand sample
+    best_trace = {**best, "traces": game_traces(int(best["Q"]), sc)}
+    runner_up = grid_row(results, top_idx[1]) if top_idx.size > 1 else None
+    runner_up_trace = (
+        {**runner_up, "traces": game_traces(int(runner_up["Q"]), sc)}
+        if runner_up is not None else None
+    )
+
+    return {
+        "results": results,
+        "best": best,
+        "top_idx": top_idx,
+        "best_trace": best_trace,
+        "runner_up": runner_up,
+        "runner_up_trace": runner_up_trace,
+    }
+
+
 def reset_app():
     """Reset saved inputs and results."""
     for k in WIDGET_KEYS:
-        if k in st.session_state:
-            del st.session_state[k]
+        st.session_state.pop(k, None)
     st.session_state["last_run"] = None
 
 
@@ -465,6 +511,28 @@ def expected_shortfall(values, alpha: float = 0.05) -> float | None:
     return float(np.mean(tail))
 
 
+def concessions_metrics(att, demand, profit, Q: int, capacity: int) -> dict[str, float]:
+    """
+    Per-game concessions metrics for one Q from its traces.
+
+    Leftover and unmet demand follow from sold (Q - sold, D - sold), so only the
+    sold array is materialized.
+    """
+    sold = np.minimum(Q, demand)
+    avg_sold = float(sold.mean())
+    q_div = max(Q, 1)
+
+    return {
+        "avg_attendance": float(att.mean()),
+        "sellout_rate": float(np.count_nonzero(att >= capacity) / att.size),
+        "p05_profit": float(np.percentile(profit, 5)),
+        "waste_rate": (Q - avg_sold) / q_div,
+        "efficiency": avg_sold / q_div,
+        "avg_unmet": float(demand.mean()) - avg_sold,
+        "hotdogs_per_1k": float((sold / np.maximum(att, 1.0)).mean() * 1000.0),
+    }
+
+
 def paired_profit_analysis(values_a, values_b) -> dict[str, float | int | None]:
     a = np.asarray(values_a, dtype=float)
     b = np.asarray(values_b, dtype=float)
@@ -559,14 +627,17 @@ def render_stat_card(label: str, value: str, height: int = 95):
 # ============================================================
 # Scoreboard + narrative helpers
 # ============================================================
+_BADGE_COLORS = {
+    "neutral": ("#F3F4F6", "#111827", "#E0E3EB"),
+    "red":     ("#FDE8E7", "#7F1D1D", "#FCA5A5"),
+    "gold":    ("#FFF7D6", "#854D0E", "#FDE68A"),
+    "blue":    ("#E8F1FF", "#1E3A8A", "#BFDBFE"),
+}
+
+
+@lru_cache(maxsize=256)
 def _badge(text: str, kind: str = "neutral") -> str:
-    colors = {
-        "neutral": ("#F3F4F6", "#111827", "#E0E3EB"),
-        "red":     ("#FDE8E7", "#7F1D1D", "#FCA5A5"),
-        "gold":    ("#FFF7D6", "#854D0E", "#FDE68A"),
-        "blue":    ("#E8F1FF", "#1E3A8A", "#BFDBFE"),
-    }
-    bg, fg, border = colors.get(kind, colors["neutral"])
+    bg, fg, border = _BADGE_COLORS.get(kind, _BADGE_COLORS["neutral"])
     return (
         f'<span style="display:inline-block; padding:4px 10px; margin-right:0px; '
         f'border-radius:999px; border:1px solid {border}; background:{bg}; color:{fg}; '
@@ -574,6 +645,108 @@ def _badge(text: str, kind: str = "neutral") -> str:
     )
 
 
+_SCOREBOARD_CSS = """
+    <style>
+        .sb-scoreboard .badge-ticker {
+        position: relative;
+        overflow: hidden;
+        background: #F8FAFF;
+        border-top: 1px solid #E0E3EB;
+        padding: 10px 12px;
+        white-space: nowrap;
+        }
+
+        /* single copy of the badges: the lane slides in from the right edge (100% of
+           the ticker) while the track slides out by its own width, so both stay
+           transform-only and the badge HTML is never duplicated */
+        .sb-scoreboard .badge-lane {
+        will-change: transform;
+        animation: badge-lane 24s linear -8s infinite;
+        }
+
+        .sb-scoreboard .badge-track {
+        display: inline-flex;
+        gap: 10px;
+        width: max-content;
+        will-change: transform;
+        animation: badge-scroll 24s linear -8s infinite;
+        }
+
+        .sb-scoreboard .badge-ticker:hover .badge-lane,
+        .sb-scoreboard .badge-ticker:hover .badge-track {
+        animation-play-state: paused;
+        }
+
+        @keyframes badge-lane {
+        0%   { transform: translateX(100%); }
+        100% { transform: translateX(0); }
+        }
+
+        @keyframes badge-scroll {
+        0%   { transform: translateX(0); }
+        100% { transform: translateX(-100%); }
+        }
+
+        @media (max-width: 520px) {
+        .sb-scoreboard .sb-top-row {
+            flex-wrap: wrap !important;
+            gap: 10px !important;
+        }
+
+        .sb-scoreboard .sb-card {
+            max-width: none !important;
+            flex: 1 1 100% !important;
+        }
+
+        .sb-scoreboard .sb-big-value {
+            white-space: nowrap !important;
+            font-size: 28px !important;
+            line-height: 1.05 !important;
+        }
+
+        .sb-scoreboard .sb-vs {
+            flex: 1 1 100% !important;
+            min-width: 0 !important;
+            display: flex !important;
+            align-items: center !important;
+            justify-content: center !important;
+            flex-direction: row !important;
+            gap: 10px !important;
+            padding: 4px 0 !important;
+            opacity: 0.55;
+        }
+
+        .sb-scoreboard .sb-vs::before,
+        .sb-scoreboard .sb-vs::after {
+            content: "";
+            height: 2px;
+            background: #E0E3EB;
+            border-radius: 999px;
+            flex: 1 1 auto;
+            max-width: 140px;
+        }
+
+        .sb-scoreboard .sb-vs-line {
+            display: none !important;
+        }
+
+        .sb-scoreboard .badge-ticker {
+            padding: 8px 10px !important;
+        }
+        }
+    </style>
+    """
+_SCOREBOARD_CSS_MIN = _minify_css(_SCOREBOARD_CSS)
+
+
+def _as_html_block(html: str) -> str:
+    """
+    Flatten an indented HTML snippet for st.markdown: no leading indentation
+    (would become a code block) and no blank lines (would end the HTML block).
+    """
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
+
+
 def render_scoreboard(
     sc: Scenario,
     *,
@@ -621,94 +794,9 @@ def render_scoreboard(
     aa = fmt_int(avg_attendance)
 
     ticker = "".join(badges)
-    ticker2 = ticker + ticker
 
     html = f"""
-    <style>
-        html, body {{
-            margin: 0;
-            padding: 0;
-            background: transparent;
-        }}
-    </style>
-
-    <div style="font-family: system-ui, -apple-system, Segoe UI, Roboto, sans-serif; display:flex; justify-content:center; padding:0;">
-
-    <style>
-        .badge-ticker {{
-        position: relative;
-        overflow: hidden;
-        background: #F8FAFF;
-        border-top: 1px solid #E0E3EB;
-        padding: 10px 12px;
-        white-space: nowrap;
-        }}
-
-        .badge-track {{
-        display: inline-flex;
-        gap: 10px;
-        width: max-content;
-        will-change: transform;
-        animation: badge-scroll 18s linear infinite;
-        }}
-
-        .badge-ticker:hover .badge-track {{
-        animation-play-state: paused;
-        }}
-
-        @keyframes badge-scroll {{
-        0%   {{ transform: translateX(0); }}
-        100% {{ transform: translateX(-50%); }}
-        }}
-
-        @media (max-width: 520px) {{
-        .sb-top-row {{
-            flex-wrap: wrap !important;
-            gap: 10px !important;
-        }}
-
-        .sb-card {{
-            max-width: none !important;
-            flex: 1 1 100% !important;
-        }}
-
-        .sb-big-value {{
-            white-space: nowrap !important;
-            font-size: 28px !important;
-            line-height: 1.05 !important;
-        }}
-
-        .sb-vs {{
-            flex: 1 1 100% !important;
-            min-width: 0 !important;
-            display: flex !important;
-            align-items: center !important;
-            justify-content: center !important;
-            flex-direction: row !important;
-            gap: 10px !important;
-            padding: 4px 0 !important;
-            opacity: 0.55;
-        }}
-
-        .sb-vs::before,
-        .sb-vs::after {{
-            content: "";
-            height: 2px;
-            background: #E0E3EB;
-            border-radius: 999px;
-            flex: 1 1 auto;
-            max-width: 140px;
-        }}
-
-        .sb-vs-line {{
-            display: none !important;
-        }}
-
-        .badge-ticker {{
-            padding: 8px 10px !important;
-        }}
-        }}
-    </style>
+    <div class="sb-scoreboard" style="font-family: system-ui, -apple-system, Segoe UI, Roboto, sans-serif; display:flex; justify-content:center; padding:0;">
 
     <div style="
         width: 100%;
@@ -779,8 +867,10 @@ def render_scoreboard(
         </div>
 
         <div class="badge-ticker">
+        <div class="badge-lane">
         <div class="badge-track">
-            {ticker2}
+            {ticker}
+        </div>
         </div>
         </div>
 
@@ -788,7 +878,7 @@ def render_scoreboard(
     </div>
     """
 
-    components.html(html, height=292)
+    st.markdown(_as_html_block(_SCOREBOARD_CSS_MIN + html), unsafe_allow_html=True)
 
 
 def make_game_script(sc: Scenario, out: dict, mode: str) -> str:
@@ -848,20 +938,23 @@ def make_game_script(sc: Scenario, out: dict, mode: str) -> str:
 # ============================================================
 # Charts
 # ============================================================
-def plot_profit_vs_q_with_refs(results: list[dict], best_q: int):
-    rows = []
-    for r in results:
-        n_games = int(r.get("n games", 0))
-        sd_profit = float(r.get("sd_profit", 0.0))
-        se_profit = (sd_profit / np.sqrt(n_games)) if n_games > 0 else 0.0
-        rows.append({
-            "Q": int(r["Q"]),
-            "avg_profit": float(r["avg_profit"]),
-            "ci_low": float(r["avg_profit"]) - 1.96 * se_profit,
-            "ci_high": float(r["avg_profit"]) + 1.96 * se_profit,
-        })
-
-    chart_df = pd.DataFrame(rows).sort_values("Q")
+_CHART_PADDING = {"left": 16, "right": 16, "top": 10, "bottom": 12}
+
+def plot_profit_vs_q_with_refs(results: dict[str, np.ndarray], best_q: int):
+    alt = _altair()
+    # float32 is plenty for plotting and halves the JSON handed to the browser
+    q = results["Q"].astype(np.int32)
+    avg = results["avg_profit"].astype(np.float32)
+    sd = results["sd_profit"].astype(np.float32)
+    n_games = results["n games"].astype(np.float32)
+    se = np.divide(sd, np.sqrt(n_games), out=np.zeros_like(sd), where=n_games > 0)
+
+    chart_df = pd.DataFrame({
+        "Q": q,
+        "avg_profit": avg,
+        "ci_low": avg - np.float32(1.96) * se,
+        "ci_high": avg + np.float32(1.96) * se,
+    }).sort_values("Q")
 
     base = alt.Chart(chart_df).encode(
         x=alt.X("Q:Q", title="Order Quantity (Q)", axis=alt.Axis(format=",.0f")),
@@ -897,13 +990,14 @@ def plot_profit_vs_q_with_refs(results: list[dict], best_q: int):
 
     chart = (
         (band + line + pts + best_pt + zero)
-        .properties(height=380, padding={"left": 16, "right": 16, "top": 10, "bottom": 12})
+        .properties(height=380, padding=_CHART_PADDING)
     )
 
     st.altair_chart(chart, use_container_width=True)
 
 
 def plot_inventory_flow(avg_sold: float, avg_leftover: float, avg_unmet: float, title: str):
+    alt = _altair()
     df = pd.DataFrame(
         [
             {"bucket": "Sold", "value": float(avg_sold), "color": KETCHUP},
@@ -928,31 +1022,22 @@ def plot_inventory_flow(avg_sold: float, avg_leftover: float, avg_unmet: float,
                 alt.Tooltip("value:Q", title="Average hot dogs", format=",.0f"),
             ],
         )
-        .properties(height=320)
+        .properties(height=320, title=title, padding=_CHART_PADDING)
     )
 
-    st.altair_chart(
-        chart.properties(
-            title=title,
-            padding={"left": 16, "right": 16, "top": 10, "bottom": 12},
-        ),
-        use_container_width=True,
-    )
+    st.altair_chart(chart, use_container_width=True)
 
 
-def plot_profit_tradeoff(results: list[dict], best_q: int):
-    chart_df = pd.DataFrame(
-        [
-            {
-                "Q": int(r["Q"]),
-                "avg_profit": float(r["avg_profit"]),
-                "stockout_rate": float(r["stockout_rate"]),
-                "avg_leftover": float(r["avg_leftover"]),
-                "is_best": int(r["Q"]) == int(best_q),
-            }
-            for r in results
-        ]
-    )
+def plot_profit_tradeoff(results: dict[str, np.ndarray], best_q: int):
+    alt = _altair()
+    q = results["Q"].astype(np.int32)
+    chart_df = pd.DataFrame({
+        "Q": q,
+        "avg_profit": results["avg_profit"].astype(np.float32),
+        "stockout_rate": results["stockout_rate"].astype(np.float32),
+        "avg_leftover": results["avg_leftover"].astype(np.float32),
+        "is_best": q == int(best_q),
+    })
     other_points = (
         alt.Chart(chart_df)
         .transform_filter("datum.is_best == false")
@@ -989,65 +1074,104 @@ def plot_profit_tradeoff(results: list[dict], best_q: int):
 
     chart = (
         (other_points + best_point)
-        .properties(height=320, padding={"left": 16, "right": 16, "top": 10, "bottom": 12})
+        .properties(height=320, padding=_CHART_PADDING)
     )
 
     st.altair_chart(chart, use_container_width=True)
 
 
 def plot_hist_numeric_eps(eps_values, step: float = 0.02):
-    df = pd.DataFrame({"eps": np.asarray(eps_values, dtype=float)})
+    alt = _altair()
+    eps = np.asarray(eps_values, dtype=np.float32)
+    edges = np.arange(
+        math.floor(float(eps.min()) / step) * step,
+        math.ceil(float(eps.max()) / step) * step + 1.5 * step,
+        step,
+    )
+    counts, edges = np.histogram(eps, bins=edges)
+    df = pd.DataFrame({"lo": edges[:-1], "hi": edges[1:], "count": counts})
 
     bars = (
         alt.Chart(df)
         .mark_bar(color=KETCHUP, opacity=0.70)
         .encode(
-            x=alt.X("eps:Q", bin=alt.Bin(step=step), title="epsilon (demand multiplier)", axis=alt.Axis(format=".2f")),
-            y=alt.Y("count():Q", title="Simulated games"),
-            tooltip=[alt.Tooltip("count():Q", title="Games")],
+            x=alt.X("lo:Q", bin="binned", title="epsilon (demand multiplier)", axis=alt.Axis(format=".2f")),
+            x2="hi:Q",
+            y=alt.Y("count:Q", title="Simulated games"),
+            tooltip=[alt.Tooltip("count:Q", title="Games")],
         )
-        .properties(height=300)
     )
 
     mean_line = (
-        alt.Chart(pd.DataFrame({"eps": [1.0]}))
+        alt.Chart(pd.DataFrame({"lo": [1.0]}))
         .mark_rule(color=MUSTARD, strokeWidth=4)
-        .encode(x="eps:Q")
+        .encode(x="lo:Q")
     )
 
-    chart = (bars + mean_line).properties(
-        padding={"left": 16, "right": 16, "top": 10, "bottom": 12}
-    )
+    chart = (bars + mean_line).properties(height=300, padding=_CHART_PADDING)
 
     st.altair_chart(chart, use_container_width=True)
 
 
+def _nice_bin_edges(arr: np.ndarray, maxbins: int) -> np.ndarray:
+    """
+    Bin edges on a 1/2/5 x 10^k step with at most maxbins bins,
+    close to what Vega-Lite's bin=alt.Bin(maxbins=...) would pick.
+    """
+    lo, hi = float(arr.min()), float(arr.max())
+    if hi <= lo:
+        return np.array([lo - 0.5, lo + 0.5])
+
+    span = hi - lo
+    mag = 10.0 ** math.floor(math.log10(span / maxbins))
+    for m in (1.0, 2.0, 5.0, 10.0):
+        step = m * mag
+        if span / step <= maxbins:
+            break
+
+    start = math.floor(lo / step) * step
+    stop = math.ceil(hi / step) * step
+    if stop <= hi:
+        stop += step
+    return np.arange(start, stop + 0.5 * step, step)
+
+
+def _histogram_df(values, maxbins: int) -> pd.DataFrame:
+    """
+    Bin on the server so the chart ships O(bins) rows instead of every simulated game.
+    """
+    arr = np.asarray(values, dtype=float)
+    counts, edges = np.histogram(arr, bins=_nice_bin_edges(arr, maxbins))
+    return pd.DataFrame({"lo": edges[:-1], "hi": edges[1:], "count": counts})
+
+
 def plot_hist_numeric(values, title: str, x_title: str, bins: int = 30, x_format: str = ".2f"):
-    df = pd.DataFrame({"x": np.asarray(values, dtype=float)})
+    alt = _altair()
+    df = _histogram_df(values, bins)
+
+    props = {"height": 300, "padding": _CHART_PADDING}
+    if title and str(title).strip():
+        props["title"] = title
 
     chart = (
         alt.Chart(df)
         .mark_bar(color=KETCHUP, opacity=0.72)
         .encode(
-            x=alt.X("x:Q", bin=alt.Bin(maxbins=bins), title=x_title, axis=alt.Axis(format=x_format)),
-            y=alt.Y("count():Q", title="Simulated games"),
-            tooltip=[alt.Tooltip("count():Q", title="Games")],
+            x=alt.X("lo:Q", bin="binned", title=x_title, axis=alt.Axis(format=x_format)),
+            x2="hi:Q",
+            y=alt.Y("count:Q", title="Simulated games"),
+            tooltip=[alt.Tooltip("count:Q", title="Games")],
         )
-        .properties(height=300, padding={"left": 16, "right": 16, "top": 10, "bottom": 12})
+        .properties(**props)
     )
 
-    if title and str(title).strip():
-        chart = chart.properties(title=title)
-
     st.altair_chart(chart, use_container_width=True)
 
 # ============================================================
-# Top buttons
+# Top bar (Run Simulation lives in the sidebar form)
 # ============================================================
-c1, c2, c3, c4 = st.columns([1, 2, 1, 1])
-with c2:
-    run_btn = st.button("Run Simulation", type="primary")
-with c4:
+_, c_reset = st.columns([4, 1])
+with c_reset:
     st.button("Reset", on_click=reset_app)
 
 # ============================================================
@@ -1062,144 +1186,150 @@ if "last_run" not in st.session_state:
 with st.sidebar:
     st.header("Scenario Inputs")
 
-    with st.expander("Decision Variable: Q", expanded=True):
-        mode = st.radio(
-            "Run mode",
-            ["Find optimal Q (grid search)", "Evaluate a single Q"],
-            index=0,
-            key="mode",
-        )
+    # Run mode and indoor stay outside the form: they change which inputs are shown
+    # or enabled, so they must apply immediately (form widgets defer until submit).
+    mode = st.radio(
+        "Run mode",
+        ["Find optimal Q (grid search)", "Evaluate a single Q"],
+        index=0,
+        key="mode",
+    )
 
-        if mode == "Evaluate a single Q":
-            Q_single = st.number_input(
-                "Order quantity Q",
-                min_value=Q_MIN,
-                max_value=Q_MAX,
-                value=20000,
-                step=500,
-                key="Q_single",
-            )
-        else:
-            Qmin = st.number_input(
-                "Q min",
-                min_value=Q_MIN,
-                max_value=Q_MAX,
-                value=15000,
-                step=500,
-                key="Qmin",
-            )
+    indoor = st.checkbox(
+        "Indoor stadium",
+        key="indoor",
+        value=bool(st.session_state.get("indoor", False)),
+        on_change=handle_indoor_toggle,
+    )
+    indoor = bool(st.session_state.get("indoor", False))
 
-            Qmax = st.number_input(
-                "Q max",
-                min_value=Q_MIN,
-                max_value=Q_MAX,
-                value=30000,
-                step=500,
-                key="Qmax",
+    # Everything else only reruns the app when Run Simulation is pressed.
+    with st.form("scenario_form", border=False):
+        run_btn = st.form_submit_button("Run Simulation", type="primary", use_container_width=True)
+
+        with st.expander("Decision Variable: Q", expanded=True):
+            if mode == "Evaluate a single Q":
+                Q_single = st.number_input(
+                    "Order quantity Q",
+                    min_value=Q_MIN,
+                    max_value=Q_MAX,
+                    value=20000,
+                    step=500,
+                    key="Q_single",
+                )
+            else:
+                Qmin = st.number_input(
+                    "Q min",
+                    min_value=Q_MIN,
+                    max_value=Q_MAX,
+                    value=15000,
+                    step=500,
+                    key="Qmin",
+                )
+
+                Qmax = st.number_input(
+                    "Q max",
+                    min_value=Q_MIN,
+                    max_value=Q_MAX,
+                    value=30000,
+                    step=500,
+                    key="Qmax",
+                )
+                step = st.number_input("Step", min_value=1, value=500, step=50, key="step")
+                Q_single = None
+
+        with st.expander("Simulation Controls", expanded=True):
+            seed = st.number_input("Random seed", value=123, step=1, key="seed")
+
+            replications = st.slider(
+                "Replications (simulated games)",
+                min_value=config.REPS_MIN,
+                max_value=config.REPS_MAX,
+                value=config.REPS_DEFAULT,
+                step=config.REPS_STEP,
+                key="replications",
             )
-            step = st.number_input("Step", min_value=1, value=500, step=50, key="step")
-            Q_single = None
-
-    with st.expander("Simulation Controls", expanded=True):
-        seed = st.number_input("Random seed", value=123, step=1, key="seed")
-
-        replications = st.slider(
-            "Replications (simulated games)",
-            min_value=config.REPS_MIN,
-            max_value=config.REPS_MAX,
-            value=config.REPS_DEFAULT,
-            step=config.REPS_STEP,
-            key="replications",
-        )
 
-    with st.expander("Economics (Newsvendor)", expanded=True):
-        price_per_dog = st.slider(
-            "Price per hot dog ($)",
-            min_value=0.00,
-            max_value=10.00,
-            value=float(getattr(config, "P_DEFAULT", 6.00)),
-            step=0.10,
-            key="price_per_dog",
-        )
+        with st.expander("Economics (Newsvendor)", expanded=True):
+            price_per_dog = st.slider(
+                "Price per hot dog ($)",
+                min_value=0.00,
+                max_value=10.00,
+                value=float(getattr(config, "P_DEFAULT", 6.00)),
+                step=0.10,
+                key="price_per_dog",
+            )
 
-        cost_per_dog = st.slider(
-            "Cost per hot dog ($)",
-            min_value=0.00,
-            max_value=5.00,
-            value=float(getattr(config, "C_DEFAULT", 1.50)),
-            step=0.05,
-            key="cost_per_dog",
-        )
+            cost_per_dog = st.slider(
+                "Cost per hot dog ($)",
+                min_value=0.00,
+                max_value=5.00,
+                value=float(getattr(config, "C_DEFAULT", 1.50)),
+                step=0.05,
+                key="cost_per_dog",
+            )
 
-        salvage_per_dog = st.slider(
-            "Salvage value per leftover ($)",
-            min_value=0.00,
-            max_value=2.00,
-            value=float(getattr(config, "S_DEFAULT", 0.25)),
-            step=0.05,
-            key="salvage_per_dog",
-        )
+            salvage_per_dog = st.slider(
+                "Salvage value per leftover ($)",
+                min_value=0.00,
+                max_value=2.00,
+                value=float(getattr(config, "S_DEFAULT", 0.25)),
+                step=0.05,
+                key="salvage_per_dog",
+            )
 
-        if salvage_per_dog > cost_per_dog:
-            st.caption("⚠️ Salvage > Cost means leftovers are 'profitable' to over-order (unusual).")
-        if price_per_dog <= cost_per_dog:
-            st.caption("⚠️ Price ≤ Cost means each sale loses money unless salvage/fixed costs change.")
-
-    with st.expander("Stadium", expanded=True):
-        stadium_capacity = st.slider(
-            "Stadium capacity",
-            min_value=config.CAPACITY_MIN,
-            max_value=config.CAPACITY_MAX,
-            value=config.CAPACITY_DEFAULT,
-            step=config.CAPACITY_STEP,
-            key="stadium_capacity",
-        )
+            if salvage_per_dog > cost_per_dog:
+                st.caption("⚠️ Salvage > Cost means leftovers are 'profitable' to over-order (unusual).")
+            if price_per_dog <= cost_per_dog:
+                st.caption("⚠️ Price ≤ Cost means each sale loses money unless salvage/fixed costs change.")
+
+        with st.expander("Stadium", expanded=True):
+            stadium_capacity = st.slider(
+                "Stadium capacity",
+                min_value=config.CAPACITY_MIN,
+                max_value=config.CAPACITY_MAX,
+                value=config.CAPACITY_DEFAULT,
+                step=config.CAPACITY_STEP,
+                key="stadium_capacity",
+            )
 
-        indoor = st.checkbox(
-            "Indoor stadium",
-            key="indoor",
-            value=bool(st.session_state.get("indoor", False)),
-            on_change=handle_indoor_toggle,
-        )
-        indoor = bool(st.session_state.get("indoor", False))
-
-    with st.expander("Weather", expanded=True):
-        temp_f_ui = st.slider(
-            "Temperature (F)",
-            min_value=int(config.TEMP_MIN_F),
-            max_value=int(config.TEMP_MAX_F),
-            key="temp_f",
-            step=1,
-            disabled=indoor,
-        )
+        with st.expander("Weather", expanded=True):
+            temp_f_ui = st.slider(
+                "Temperature (F)",
+                min_value=int(config.TEMP_MIN_F),
+                max_value=int(config.TEMP_MAX_F),
+                key="temp_f",
+                step=1,
+                disabled=indoor,
+            )
 
-        col_w1, col_w2 = st.columns(2)
-        with col_w1:
-            rain_ui = st.checkbox("Rain", key="rain", value=bool(st.session_state.get("rain", False)), disabled=indoor)
-        with col_w2:
-            snow_ui = st.checkbox("Snow", key="snow", value=bool(st.session_state.get("snow", False)), disabled=indoor)
-
-        if indoor:
-            st.caption(f"Indoor stadium: weather + temperature are ignored.")
-
-        temp_f = float(IDEAL_TEMP_F if indoor else temp_f_ui)
-        rain = False if indoor else bool(rain_ui)
-        snow = False if indoor else bool(snow_ui)
-
-    with st.expander("Game Context", expanded=True):
-        col_g1, col_g2 = st.columns(2)
-        with col_g1:
-            promo = st.checkbox("Promotion", key="promo", value=bool(st.session_state.get("promo", False)))
-        with col_g2:
-            playoff = st.checkbox("Playoff game", key="playoff", value=bool(st.session_state.get("playoff", False)))
-
-    with st.expander("Team record (Wins / Losses)", expanded=True):
-        season_games = config.SEASON_GAMES
-        team_wins = st.slider("Team wins", 0, season_games, 9, key="team_wins")
-        team_losses = st.slider("Team losses", 0, season_games, 8, key="team_losses")
-        st.divider()
-        opp_wins = st.slider("Opponent wins", 0, season_games, 9, key="opp_wins")
-        opp_losses = st.slider("Opponent losses", 0, season_games, 8, key="opp_losses")
+            col_w1, col_w2 = st.columns(2)
+            with col_w1:
+                rain_ui = st.checkbox("Rain", key="rain", value=bool(st.session_state.get("rain", False)), disabled=indoor)
+            with col_w2:
+                snow_ui = st.checkbox("Snow", key="snow", value=bool(st.session_state.get("snow", False)), disabled=indoor)
+
+            if indoor:
+                st.caption(f"Indoor stadium: weather + temperature are ignored.")
+
+            temp_f = float(IDEAL_TEMP_F if indoor else temp_f_ui)
+            rain = False if indoor else bool(rain_ui)
+            snow = False if indoor else bool(snow_ui)
+
+        with st.expander("Game Context", expanded=True):
+            col_g1, col_g2 = st.columns(2)
+            with col_g1:
+                promo = st.checkbox("Promotion", key="promo", value=bool(st.session_state.get("promo", False)))
+            with col_g2:
+                playoff = st.checkbox("Playoff game", key="playoff", value=bool(st.session_state.get("playoff", False)))
+
+        with st.expander("Team record (Wins / Losses)", expanded=True):
+            season_games = config.SEASON_GAMES
+            team_wins = st.slider("Team wins", 0, season_games, 9, key="team_wins")
+            team_losses = st.slider("Team losses", 0, season_games, 8, key="team_losses")
+            st.divider()
+            opp_wins = st.slider("Opponent wins", 0, season_games, 9, key="opp_wins")
+            opp_losses = st.slider("Opponent losses", 0, season_games, 8, key="opp_losses")
 
 # ============================================================
 # Build Scenario
@@ -1250,12 +1380,11 @@ if run_btn:
 
             if mode == "Evaluate a single Q":
                 q_ran = int(Q_single)
-                summary = simulate_many(Q=q_ran, sc=sc, return_traces=True)
+                run_single(asdict(sc), q_ran)
                 st.session_state.last_run = {
                     "mode": "single",
                     "scenario": sc,
                     "Q": q_ran,
-                    "summary": summary,
                     "meta": run_meta,
                 }
             else:
@@ -1279,27 +1408,11 @@ if run_btn:
                         }
 
                     else:
-                        Q_values = list(range(int(Qmin), int(Qmax) + 1, int(step)))
-                        results = evaluate_grid(Q_values, sc=sc)
-
-                        best = max(results, key=lambda r: r["avg_profit"])
-                        top10 = sorted(results, key=lambda r: r["avg_profit"], reverse=True)[:10]
-                        best_trace = simulate_many(Q=int(best["Q"]), sc=sc, return_traces=True)
-                        runner_up = top10[1] if len(top10) > 1 else None
-                        runner_up_trace = (
-                            simulate_many(Q=int(runner_up["Q"]), sc=sc, return_traces=True)
-                            if runner_up is not None else None
-                        )
+                        run_grid(asdict(sc), int(Qmin), int(Qmax), int(step))
 
                         st.session_state.last_run = {
                             "mode": "grid",
                             "scenario": sc,
-                            "results": results,
-                            "best": best,
-                            "top10": top10,
-                            "best_trace": best_trace,
-                            "runner_up": runner_up,
-                            "runner_up_trace": runner_up_trace,
                             "grid": {
                                 "Qmin": int(Qmin),
                                 "Qmax": int(Qmax),
@@ -1323,16 +1436,18 @@ with tab_results:
         st.code(str(last.get("scenario")))
 
     elif last.get("mode") == "single":
-        summary = last["summary"]
+        summary = run_single(asdict(last["scenario"]), last["Q"])
         traces = summary.get("traces")
 
-        sellout_rate: float | None = None
-        avg_attendance: float | None = None
-
-        if traces:
-            att = np.asarray(traces["attendance"], dtype=float)
-            avg_attendance = float(np.mean(att))
-            sellout_rate = float(np.mean(att >= stadium_capacity))
+        cm = (
+            concessions_metrics(
+                traces["attendance"], traces["demand"], traces["profit"],
+                int(last["Q"]), stadium_capacity,
+            )
+            if traces else {}
+        )
+        sellout_rate: float | None = cm.get("sellout_rate")
+        avg_attendance: float | None = cm.get("avg_attendance")
 
         render_scoreboard(
             last["scenario"],
@@ -1350,12 +1465,11 @@ with tab_results:
                 f"Last run: {meta.get('ran_at','')} • Seed: {meta.get('seed','')} • Replications: {meta.get('replications','')}"
             )
 
-        traces = summary.get("traces")
-        p05_profit = None
-        waste_rate = None
-        hotdogs_per_1k = None
-        efficiency = None
-        avg_unmet = None
+        p05_profit = cm.get("p05_profit")
+        waste_rate = cm.get("waste_rate")
+        hotdogs_per_1k = cm.get("hotdogs_per_1k")
+        efficiency = cm.get("efficiency")
+        avg_unmet = cm.get("avg_unmet")
 
         profit_se = None
         profit_ci_low = None
@@ -1365,23 +1479,7 @@ with tab_results:
         expected_shortfall_5 = None
 
         if traces:
-            att = np.asarray(traces["attendance"], dtype=float)
-            profit = np.asarray(traces["profit"], dtype=float)
-            demand = np.asarray(traces["demand"], dtype=float)
-
-            Q_used = int(last["Q"])
-            sold_est = np.minimum(Q_used, demand)
-            leftover_est = np.maximum(Q_used - demand, 0)
-            unmet_est = np.maximum(demand - Q_used, 0)
-
-            sellout_rate = float(np.mean(att >= stadium_capacity))
-            p05_profit = float(np.percentile(profit, 5))
-            waste_rate = float(np.mean(leftover_est / max(Q_used, 1)))
-            efficiency = float(np.mean(sold_est / max(Q_used, 1)))
-            avg_unmet = float(np.mean(unmet_est))
-
-            denom = np.maximum(att, 1.0)
-            hotdogs_per_1k = float(np.mean((sold_est / denom) * 1000.0))
+            profit = traces["profit"]
 
             n_games = profit.size
             _, profit_se, profit_ci_low, profit_ci_high = mean_ci_95(profit)
@@ -1463,20 +1561,23 @@ with tab_results:
                 plot_hist_numeric(traces["eps"], title="", x_title="epsilon (demand multiplier)", bins=30, x_format=".2f")
 
     else:
-        best = last["best"]
-        top10 = last["top10"]
-        results = last["results"]
-        best_trace = last.get("best_trace")
-        runner_up = last.get("runner_up")
-        runner_up_trace = last.get("runner_up_trace")
-
-        sellout_rate: float | None = None
-        avg_attendance: float | None = None
-
-        if best_trace and best_trace.get("traces"):
-            att = np.asarray(best_trace["traces"]["attendance"], dtype=float)
-            avg_attendance = float(np.mean(att))
-            sellout_rate = float(np.mean(att >= stadium_capacity))
+        grid_run = run_grid(asdict(last["scenario"]), **last["grid"])
+        best = grid_run["best"]
+        results = grid_run["results"]
+        best_trace = grid_run.get("best_trace")
+        runner_up = grid_run.get("runner_up")
+        runner_up_trace = grid_run.get("runner_up_trace")
+
+        best_traces = best_trace.get("traces") if best_trace else None
+        cm = (
+            concessions_metrics(
+                best_traces["attendance"], best_traces["demand"], best_traces["profit"],
+                int(best["Q"]), stadium_capacity,
+            )
+            if best_traces else {}
+        )
+        sellout_rate: float | None = cm.get("sellout_rate")
+        avg_attendance: float | None = cm.get("avg_attendance")
 
         render_scoreboard(
             last["scenario"],
@@ -1493,11 +1594,11 @@ with tab_results:
                 f"Last run: {meta.get('ran_at','')} • Seed: {meta.get('seed','')} • Replications: {meta.get('replications','')}"
             )
 
-        p05_profit = None
-        waste_rate = None
-        hotdogs_per_1k = None
-        efficiency = None
-        avg_unmet = None
+        p05_profit = cm.get("p05_profit")
+        waste_rate = cm.get("waste_rate")
+        hotdogs_per_1k = cm.get("hotdogs_per_1k")
+        efficiency = cm.get("efficiency")
+        avg_unmet = cm.get("avg_unmet")
 
         profit_se = None
         profit_ci_low = None
@@ -1507,24 +1608,9 @@ with tab_results:
         expected_shortfall_5 = None
         paired_vs_runner = None
 
-        if best_trace and best_trace.get("traces"):
-            traces = best_trace["traces"]
-            att = np.asarray(traces["attendance"], dtype=float)
-            profit = np.asarray(traces["profit"], dtype=float)
-            demand = np.asarray(traces["demand"], dtype=float)
-
-            Q_used = int(best["Q"])
-            sold_est = np.minimum(Q_used, demand)
-            leftover_est = np.maximum(Q_used - demand, 0)
-            unmet_est = np.maximum(demand - Q_used, 0)
-
-            p05_profit = float(np.percentile(profit, 5))
-            waste_rate = float(np.mean(leftover_est / max(Q_used, 1)))
-            efficiency = float(np.mean(sold_est / max(Q_used, 1)))
-            avg_unmet = float(np.mean(unmet_est))
-
-            denom = np.maximum(att, 1.0)
-            hotdogs_per_1k = float(np.mean((sold_est / denom) * 1000.0))
+        if best_traces:
+            traces = best_traces
+            profit = traces["profit"]
 
             n_games = profit.size
             _, profit_se, profit_ci_low, profit_ci_high = mean_ci_95(profit)
@@ -1642,11 +1728,18 @@ with tab_results:
         st.info(script)
 
         st.subheader("Top 10 Q values")
-        df = pd.DataFrame(top10).copy()
+        # typed columns straight from the grid arrays (no per-row dicts or dtype inference)
+        top_idx = grid_run["top_idx"]
+        df = pd.DataFrame({
+            # Q and n games fit int32; seed stays int64 (the seed input is unbounded)
+            k: v[top_idx].astype(np.int32) if k in ("Q", "n games") else v[top_idx]
+            for k, v in results.items()
+        })
 
+        # format at display time only; the columns stay numeric for Arrow
         INT_COLS = [
             "Q",
-            "n_games",
+            "n games",
             "seed",
             "min_profit",
             "max_profit",
@@ -1655,22 +1748,20 @@ with tab_results:
             "avg_sold",
             "avg_leftover",
         ]
-        for col in INT_COLS:
-            if col in df.columns:
-                df[col] = df[col].round(0).astype(int).map("{:,}".format)
-
         MONEY_COLS = ["avg_profit", "sd_profit"]
-        for col in MONEY_COLS:
-            if col in df.columns:
-                df[col] = df[col].round(0).astype(int).map("${:,}".format)
-
         RATE_COLS = ["stockout_rate"]
-        for col in RATE_COLS:
-            if col in df.columns:
-                df[col] = (df[col] * 100).round(1).astype(str) + "%"
+
+        fmt = (
+            {c: "{:,.0f}" for c in INT_COLS}
+            | {c: "${:,.0f}" for c in MONEY_COLS}
+            | {c: "{:.1%}" for c in RATE_COLS}
+        )
 
         st.subheader("Grid summary")
-        st.dataframe(df, use_container_width=True)
+        st.dataframe(
+            df.style.format({c: f for c, f in fmt.items() if c in df.columns}),
+            use_container_width=True,
+        )
 
         if best_trace and best_trace.get("traces"):
             traces = best_trace["traces"]
@@ -52,6 +52,11 @@ SNOW_PENALTY = 0.95
 TEAM_WIN_BOOST_AT_1 = 1.10
 OPPONENT_WIN_BOOST_AT_1 = 1.05
 
+# floors on the individual multipliers (shared by the scalar and batch paths)
+TEMP_MULT_MIN = 0.70
+TEAM_WIN_MULT_MIN = 0.80
+OPPONENT_WIN_MULT_MIN = 0.90
+
 
 # =========================
 # UI input ranges (for sliders/radios)
@@ -3,15 +3,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import random
+from functools import lru_cache
+import math
+
+import numpy as np
 
 from . import config
 from .scenario import Scenario
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GameResult:
-    """Outputs from a single simulated game."""
+    """Outputs from a single simulated game (scalar path only; runs use arrays)."""
     Q: int
     D: int
     sold: int
@@ -31,7 +34,7 @@ def _clip(x: float, lo: float, hi: float) -> float:
     return max(lo, min(x, hi))
 
 
-def _win_pct_multiplier(win_pct: float, boost_at_1: float, min_mult: float = 0.80) -> float:
+def _win_pct_multiplier(win_pct: float, boost_at_1: float, min_mult: float) -> float:
     """
     Centered scaling around 0.500 so lower win rates reduce attendance and higher win rates increase it.
 
@@ -44,56 +47,130 @@ def _win_pct_multiplier(win_pct: float, boost_at_1: float, min_mult: float = 0.8
     return max(min_mult, m)
 
 
+@lru_cache(maxsize=256)
 def attendance_multiplier(sc: Scenario) -> float:
     """
     Multiplicative attendance effects from the scenario (promo/playoff/weather/records).
-    """
-    m = 1.0
 
-    if sc.promo:
-        m *= config.PROMO_BOOST
-    if sc.playoff:
-        m *= config.PLAYOFF_BOOST
+    Scenario is frozen (hashable), so the result is memoized per scenario.
+    """
+    terms = [
+        config.PROMO_BOOST if sc.promo else 1.0,
+        config.PLAYOFF_BOOST if sc.playoff else 1.0,
+    ]
 
-    # Precipitation
     # Weather effects (ignored if indoor)
     if not sc.indoor:
+        # Temperature discomfort penalty
+        tens = abs(sc.temp_f - config.TEMP_IDEAL_F) / 10.0
+        temp_mult = max(config.TEMP_MULT_MIN, 1.0 - config.TEMP_PENALTY_PER_10F * tens)
+
+        terms += [
+            # Precipitation
+            config.RAIN_PENALTY if sc.rain else 1.0,
+            getattr(config, "SNOW_PENALTY", config.RAIN_PENALTY) if sc.snow else 1.0,
+            temp_mult,
+            # Team + opponent performance (wins/losses -> win_pct computed in Scenario)
+            _win_pct_multiplier(
+                sc.team_win_pct, config.TEAM_WIN_BOOST_AT_1, min_mult=config.TEAM_WIN_MULT_MIN
+            ),
+            _win_pct_multiplier(
+                sc.opp_win_pct, config.OPPONENT_WIN_BOOST_AT_1, min_mult=config.OPPONENT_WIN_MULT_MIN
+            ),
+        ]
+
+    return math.prod(terms)
+
+
+def attendance_multiplier_batch(
+    promo: np.ndarray,
+    playoff: np.ndarray,
+    indoor: np.ndarray,
+    rain: np.ndarray,
+    snow: np.ndarray,
+    temp_f: np.ndarray,
+    team_win_pct: np.ndarray,
+    opp_win_pct: np.ndarray,
+) -> np.ndarray:
+    """
+    attendance_multiplier for many scenarios at once, from parallel arrays of
+    scenario fields (e.g. for a weather/record sweep). Same terms, same order.
+    """
+    promo, playoff, indoor, rain, snow = (
+        np.asarray(x, dtype=bool) for x in (promo, playoff, indoor, rain, snow)
+    )
+    temp_f, team_win_pct, opp_win_pct = (
+        np.asarray(x, dtype=float) for x in (temp_f, team_win_pct, opp_win_pct)
+    )
 
-        # Precipitation
-        if sc.rain:
-            m *= config.RAIN_PENALTY
-        if sc.snow:
-            m *= getattr(config, "SNOW_PENALTY", config.RAIN_PENALTY)
+    tens = np.abs(temp_f - config.TEMP_IDEAL_F) / 10.0
+    temp_mult = np.maximum(config.TEMP_MULT_MIN, 1.0 - config.TEMP_PENALTY_PER_10F * tens)
 
-        # Temperature discomfort penalty
-        dist = abs(sc.temp_f - config.TEMP_IDEAL_F)
-        tens = dist / 10.0
-        temp_mult = 1.0 - config.TEMP_PENALTY_PER_10F * tens
-        temp_mult = max(0.70, temp_mult)
-        m *= temp_mult
+    team_slope = config.TEAM_WIN_BOOST_AT_1 - 1.0
+    opp_slope = config.OPPONENT_WIN_BOOST_AT_1 - 1.0
+    team_mult = np.maximum(config.TEAM_WIN_MULT_MIN, 1.0 + (team_win_pct - 0.5) * 2.0 * team_slope)
+    opp_mult = np.maximum(config.OPPONENT_WIN_MULT_MIN, 1.0 + (opp_win_pct - 0.5) * 2.0 * opp_slope)
+
+    m = np.where(promo, config.PROMO_BOOST, 1.0)
+    m = m * np.where(playoff, config.PLAYOFF_BOOST, 1.0)
 
-        # Team + opponent performance (wins/losses -> win_pct computed in Scenario)
-        m *= _win_pct_multiplier(sc.team_win_pct, config.TEAM_WIN_BOOST_AT_1)
-        m *= _win_pct_multiplier(sc.opp_win_pct, config.OPPONENT_WIN_BOOST_AT_1, min_mult=0.90)
+    # Weather effects (ignored if indoor)
+    outdoor = (
+        np.where(rain, config.RAIN_PENALTY, 1.0)
+        * np.where(snow, getattr(config, "SNOW_PENALTY", config.RAIN_PENALTY), 1.0)
+    )
+    outdoor = m * outdoor * temp_mult * team_mult * opp_mult
 
-    return m
+    return np.where(indoor, m, outdoor)
 
 
 # =========================
 # Random draws
 # =========================
 
-def sample_epsilon(rng: random.Random) -> float:
+def make_rng(seed: int, *spawn_key: int) -> np.random.Generator:
+    """
+    NumPy Generator for a UI/CLI seed; spawn_key selects an independent child stream.
+
+    SeedSequence needs non-negative entropy but seeds may be negative, so the seed
+    is reduced mod 2**64 (non-negative seeds give the same stream as default_rng(seed)).
+    """
+    return np.random.default_rng(np.random.SeedSequence(seed % 2**64, spawn_key=spawn_key))
+
+
+def epsilon_params() -> tuple[float, float]:
+    """
+    Log-space (mu, sigma) of epsilon; mu = -sigma^2/2 so E[epsilon] ~ 1.
+    """
+    sigma = config.EPS_SIGMA
+    return -0.5 * sigma * sigma, sigma
+
+
+def sample_epsilon(rng: np.random.Generator) -> float:
     """
     Multiplicative noise factor epsilon with mean ~ 1.0.
     lognormal with sigma in log-space (EPS_SIGMA).
     """
-    sigma = config.EPS_SIGMA
-    mu = -0.5 * sigma * sigma  # so E[epsilon] ~ 1
-    return rng.lognormvariate(mu, sigma)
+    mu, sigma = epsilon_params()
+    return float(rng.lognormal(mu, sigma))
+
+
+def attendance_params(sc: Scenario) -> tuple[float, float, float]:
+    """
+    Scenario-level attendance parameters (capacity, adjusted mean, sigma).
+
+    These don't vary between games, so samplers compute them once per call
+    rather than per draw.
+    """
+    cap = float(sc.stadium_capacity)
+
+    mu0 = cap * config.BASE_FILL_RATE
+    sigma0 = max(float(config.MIN_STD), mu0 * config.A_STD_FRAC)
+
+    return cap, mu0 * attendance_multiplier(sc), sigma0
 
 
-def sample_attendance(rng: random.Random, sc: Scenario) -> int:
+def sample_attendance(rng: np.random.Generator, sc: Scenario) -> int:
     """
     Attendance model:
       1) baseline mean = capacity * BASE_FILL_RATE
@@ -101,23 +178,18 @@ def sample_attendance(rng: random.Random, sc: Scenario) -> int:
       3) adjust mean by attendance_multiplier(scenario)
       4) sample Normal(mean_adj, sigma)
       5) clamp to [0, capacity]
-    """
-    sc.validate()
-
-    cap = float(sc.stadium_capacity)
-
-    mu0 = cap * config.BASE_FILL_RATE
-    sigma0 = max(float(config.MIN_STD), mu0 * config.A_STD_FRAC)
 
-    mu = mu0 * attendance_multiplier(sc)
+    The scenario is assumed valid; callers validate once up front.
+    """
+    cap, mu, sigma0 = attendance_params(sc)
 
-    a = rng.gauss(mu, sigma0)
+    a = float(rng.normal(mu, sigma0))
     a = _clip(a, 0.0, cap)
 
     return int(round(a))
 
 
-def sample_demand(rng: random.Random, sc: Scenario) -> tuple[int, int, float]:
+def sample_demand(rng: np.random.Generator, sc: Scenario) -> tuple[int, int, float]:
     """
     Demand model:
       D = round( attendance * R_BASE * epsilon )
@@ -132,10 +204,78 @@ def sample_demand(rng: random.Random, sc: Scenario) -> tuple[int, int, float]:
     return int(round(d)), a, eps
 
 
+# =========================
+# Vectorized random draws
+# =========================
+
+def sample_epsilon_vec(rng: np.random.Generator, n: int) -> np.ndarray:
+    """
+    n draws of epsilon at once (same lognormal as sample_epsilon), in one
+    Generator.lognormal call.
+    """
+    mu, sigma = epsilon_params()
+    return rng.lognormal(mu, sigma, size=n)
+
+
+def sample_attendance_vec(rng: np.random.Generator, sc: Scenario, n: int) -> np.ndarray:
+    """
+    n draws of attendance at once (same model as sample_attendance), as int32.
+    """
+    return _attendance_from_params(rng, attendance_params(sc), n)
+
+
+def _attendance_from_params(
+    rng: np.random.Generator, params: tuple[float, float, float], n: int
+) -> np.ndarray:
+    cap, mu, sigma0 = params
+
+    a = rng.normal(mu, sigma0, size=n)
+    np.clip(a, 0.0, cap, out=a)
+
+    return np.rint(a).astype(np.int32)
+
+
+def sample_demand_vec(rng: np.random.Generator, sc: Scenario, n: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    n games of the demand model at once.
+
+    Returns (D, attendance, epsilon) arrays; D and attendance are int32 (capacity
+    is at most CAPACITY_MAX, far inside int32), epsilon is float64.
+    The scenario is assumed valid; callers validate once up front.
+    """
+    return sample_demand_from_params(rng, attendance_params(sc), n)
+
+
+def sample_demand_from_params(
+    rng: np.random.Generator, params: tuple[float, float, float], n: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    sample_demand_vec given attendance_params(sc) instead of the scenario.
+
+    Demand depends on the scenario only through these three numbers, so draws
+    can be cached on them (economics and replication count don't matter).
+    """
+    a = _attendance_from_params(rng, params, n)
+    eps = sample_epsilon_vec(rng, n)
+
+    d = a * config.R_BASE * eps
+    np.maximum(d, 0.0, out=d)
+    return np.rint(d).astype(np.int32), a, eps
+
+
 # =========================
 # Profit Function
 # =========================
 
+@lru_cache(maxsize=256)
+def economics(sc: Scenario) -> tuple[float, float, float, float]:
+    """
+    (price, cost, salvage, fixed cost per game) as plain floats, memoized per scenario.
+    """
+    fixed = getattr(sc, "fixed_cost_per_game", getattr(config, "FIXED_COST_PER_GAME", 0.0))
+    return float(sc.price), float(sc.cost), float(sc.salvage), float(fixed)
+
+
 def profit_for_game(Q: int, D: int, attendance: int, sc: Scenario) -> GameResult:
     """
     Newsvendor profit:
@@ -149,10 +289,7 @@ def profit_for_game(Q: int, D: int, attendance: int, sc: Scenario) -> GameResult
     sold = min(Q, D)
     leftover = max(Q - D, 0)
 
-    p = float(sc.price)
-    c = float(sc.cost)
-    s = float(sc.salvage)
-    fixed = float(getattr(sc, "fixed_cost_per_game", getattr(config, "FIXED_COST_PER_GAME", 0.0)))
+    p, c, s, fixed = economics(sc)
 
     revenue = p * sold
     cost = c * Q
@@ -170,12 +307,47 @@ def simulate_one_game(Q: int, sc: Scenario, seed: int | None = None) -> GameResu
     """
     Simulate one game under a scenario and compute profit.
     """
-    rng = random.Random(sc.seed if seed is None else seed)
+    sc.validate()
+
+    rng = make_rng(sc.seed if seed is None else seed)
     D, a, _ = sample_demand(rng, sc)
     return profit_for_game(Q, D, a, sc)
 
 
+def _check_multiplier_batch() -> None:
+    """
+    Assert attendance_multiplier_batch matches attendance_multiplier over a grid of
+    flags, temperatures and records (run via `python -m src.game`).
+    """
+    import itertools
+
+    scenarios = [
+        Scenario(
+            indoor=indoor, rain=weather == "rain", snow=weather == "snow",
+            promo=promo, playoff=playoff, temp_f=temp,
+            team_wins=tw, team_losses=config.SEASON_GAMES - tw,
+            opp_wins=ow, opp_losses=config.SEASON_GAMES - ow,
+        )
+        for indoor, weather, promo, playoff, temp, tw, ow in itertools.product(
+            (False, True), ("dry", "rain", "snow"), (False, True), (False, True),
+            (config.TEMP_MIN_F, 20, config.TEMP_IDEAL_F, 90, config.TEMP_MAX_F),
+            (0, 5, 10, 20), (0, 10, 20),
+        )
+        if not (indoor and weather != "dry")
+    ]
+    batch = attendance_multiplier_batch(
+        *(
+            [getattr(sc, name) for sc in scenarios]
+            for name in ("promo", "playoff", "indoor", "rain", "snow", "temp_f", "team_win_pct", "opp_win_pct")
+        )
+    )
+    scalar = np.array([attendance_multiplier(sc) for sc in scenarios])
+    assert np.allclose(batch, scalar, rtol=1e-12, atol=0.0), np.abs(batch - scalar).max()
+
+
 if __name__ == "__main__":
+    _check_multiplier_batch()
+
     sc = Scenario()
     res = simulate_one_game(Q=20000, sc=sc, seed=42)
     print(res)
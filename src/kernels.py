@@ -0,0 +1,238 @@
+# src/kernels.py
+# compiled / vectorized profit kernels used by run_sim
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    import numba
+    from numba import njit, prange
+except ImportError:  # numba is optional; the NumPy kernels below are used instead
+    njit = None
+else:
+    # Streamlit calls into here from its script threads; a TBB pool started off the
+    # main thread can hang interpreter shutdown, so prefer OpenMP when it's there.
+    numba.config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+
+# The workqueue layer (the only one on installs without OpenMP/TBB) aborts the
+# process if two threads enter parallel kernels at once, and Streamlit sessions
+# each run in their own thread, so calls into the prange kernels are serialized.
+_PARALLEL_LOCK = threading.Lock()
+
+
+# =========================
+# Profit kernel
+# =========================
+
+def profit_kernel_np(Q: int, D: np.ndarray, p: float, c: float, s: float, fixed: float) -> np.ndarray:
+    """
+    Per-game newsvendor profit for one Q over an array of demands:
+      profit = p*min(Q,D) - c*Q + s*max(Q-D, 0) - fixed
+
+    Since min(Q,D) + max(Q-D, 0) = Q, every kernel here evaluates the
+    equivalent folded form (p-s)*min(Q,D) + (s-c)*Q - fixed.
+    """
+    return (p - s) * np.minimum(Q, D) + ((s - c) * Q - fixed)
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def profit_kernel(Q, D, p, c, s, fixed):
+        pms = p - s
+        base = (s - c) * Q - fixed
+        out = np.empty(D.shape[0])
+        for i in range(D.shape[0]):
+            out[i] = pms * min(Q, D[i]) + base
+        return out
+else:
+    profit_kernel = profit_kernel_np
+
+
+def profit_stats_np(
+    Q: int, D: np.ndarray, p: float, c: float, s: float, fixed: float
+) -> tuple[float, ...]:
+    """
+    Profit statistics for one Q over a demand sample.
+
+    Returns (avg_profit, sd_profit, min_profit, max_profit, avg_sold, stockout_rate).
+    """
+    sold = np.minimum(Q, D)
+    profit = (p - s) * sold + ((s - c) * Q - fixed)
+    return (
+        profit.mean(), profit.std(), profit.min(), profit.max(),
+        sold.mean(), np.count_nonzero(D > Q) / D.shape[0],
+    )
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _profit_stats_jit(Q, D, p, c, s, fixed):
+        # one fused, multithreaded pass: no per-game profit or sold arrays
+        n = D.shape[0]
+        pms = p - s
+        base = (s - c) * Q - fixed
+        # shift by the first game's profit so the one-pass variance stays accurate
+        k = pms * min(Q, D[0]) + base
+        tot = 0.0
+        tot2 = 0.0
+        sold_tot = 0.0
+        # fastmath assumes no infinities, so min/max start from a real profit
+        mn = k
+        mx = k
+        short = 0  # stockouts, counted branch-free
+        for i in prange(n):
+            sold = min(Q, D[i])
+            pr = pms * sold + base
+            dev = pr - k
+            tot += dev
+            tot2 += dev * dev
+            sold_tot += sold
+            mn = min(mn, pr)
+            mx = max(mx, pr)
+            short += D[i] > Q
+        m = tot / n
+        var = max(tot2 / n - m * m, 0.0)
+        return k + m, np.sqrt(var), mn, mx, sold_tot / n, short / n
+
+    def profit_stats(Q, D, p, c, s, fixed):
+        with _PARALLEL_LOCK:
+            return _profit_stats_jit(Q, D, p, c, s, fixed)
+else:
+    profit_stats = profit_stats_np
+
+
+# (Q x replications) elements per tile in the NumPy grid kernel: ~2 MB of float64,
+# so a tile's temporaries stay cache-resident instead of streaming through DRAM
+GRID_BLOCK_ELEMS = 262_144
+
+# threads used by the NumPy grid kernel (its ufuncs release the GIL on big arrays)
+GRID_WORKERS = os.cpu_count() or 1
+
+
+def set_workers(n: int) -> None:
+    """
+    Cap the threads used by the parallel kernels (NumPy thread pool and numba prange).
+    """
+    global GRID_WORKERS
+
+    if n <= 0:
+        raise ValueError("workers must be > 0")
+
+    GRID_WORKERS = n
+    if njit is not None:
+        numba.set_num_threads(min(n, numba.config.NUMBA_NUM_THREADS))
+
+
+def grid_kernel_np(
+    qs: np.ndarray, D: np.ndarray, p: float, c: float, s: float, fixed: float
+) -> tuple[np.ndarray, ...]:
+    """
+    Profit statistics for every Q in qs against one shared demand sample.
+
+    Broadcasts (Q x replications) tiles of the profit matrix, so there is no
+    per-game or per-Q Python loop; cache-sized tiles keep peak memory bounded for
+    large grids and are spread over a thread pool when more than one core is available.
+
+    Returns (avg_profit, sd_profit, min_profit, max_profit, avg_sold, stockout_rate),
+    each an array aligned with qs.
+    """
+    G = qs.shape[0]
+    avg = np.empty(G)
+    sd = np.empty(G)
+    lo = np.empty(G)
+    hi = np.empty(G)
+    avg_sold = np.empty(G)
+    stockout = np.empty(G)
+
+    Drow = D[None, :]
+    workers = GRID_WORKERS
+    blk = max(1, GRID_BLOCK_ELEMS // max(D.shape[0], 1))
+    if workers > 1:
+        # make sure every thread gets some of the grid
+        blk = max(1, min(blk, -(-G // workers)))
+
+    def fill(j0: int) -> None:
+        # (Q x games) tile: each row is contiguous, so the reductions run along memory
+        Q = qs[j0:j0 + blk, None]
+        sold = np.minimum(Drow, Q)
+        avg_sold[j0:j0 + blk] = sold.mean(axis=1)
+        stockout[j0:j0 + blk] = np.count_nonzero(Drow > Q, axis=1) / D.shape[0]
+
+        # folded profit, built in place: one full-size float buffer per tile
+        profit = np.multiply(sold, p - s)
+        profit += (s - c) * Q - fixed
+
+        avg[j0:j0 + blk] = profit.mean(axis=1)
+        sd[j0:j0 + blk] = profit.std(axis=1)
+        lo[j0:j0 + blk] = profit.min(axis=1)
+        hi[j0:j0 + blk] = profit.max(axis=1)
+
+    starts = range(0, G, blk)
+    if workers > 1 and len(starts) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(fill, starts))
+    else:
+        for j0 in starts:
+            fill(j0)
+
+    return avg, sd, lo, hi, avg_sold, stockout
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True, parallel=True)
+    def _grid_kernel_jit(qs, D, p, c, s, fixed):
+        G = qs.shape[0]
+        n = D.shape[0]
+        avg = np.empty(G)
+        sd = np.empty(G)
+        lo = np.empty(G)
+        hi = np.empty(G)
+        avg_sold = np.empty(G)
+        stockout = np.empty(G)
+
+        pms = p - s
+        # each Q is an independent sub-problem over the same demand sample
+        for j in prange(G):
+            Q = qs[j]
+            base = (s - c) * Q - fixed
+            tot = 0.0
+            sold_tot = 0.0
+            # fastmath assumes no infinities, so min/max start from game 0's profit
+            mn = pms * min(Q, D[0]) + base
+            mx = mn
+            short = 0
+            for i in range(n):
+                sold = min(Q, D[i])
+                pr = pms * sold + base
+                tot += pr
+                sold_tot += sold
+                mn = min(mn, pr)
+                mx = max(mx, pr)
+                short += D[i] > Q
+            m = tot / n
+
+            # second pass for a numerically stable population sd
+            ss = 0.0
+            for i in range(n):
+                dev = pms * min(Q, D[i]) + base - m
+                ss += dev * dev
+
+            avg[j] = m
+            sd[j] = np.sqrt(ss / n)
+            lo[j] = mn
+            hi[j] = mx
+            avg_sold[j] = sold_tot / n
+            stockout[j] = short / n
+
+        return avg, sd, lo, hi, avg_sold, stockout
+
+    def grid_kernel(qs, D, p, c, s, fixed):
+        with _PARALLEL_LOCK:
+            return _grid_kernel_jit(qs, D, p, c, s, fixed)
+else:
+    grid_kernel = grid_kernel_np
@@ -2,14 +2,97 @@
 from __future__ import annotations
 
 import argparse
-import random
-from statistics import mean, pstdev
+from functools import lru_cache
 from typing import Iterable
 
-from . import game, config
+import numpy as np
+
+from . import game, kernels
 from .scenario import Scenario
 
 
+def _summary_row(
+    Q: int,
+    n: int,
+    seed: int,
+    sc: Scenario,
+    fixed: float,
+    avg_profit: float,
+    sd_profit: float,
+    min_profit: float,
+    max_profit: float,
+    avg_attendance: float,
+    avg_demand: float,
+    avg_sold: float,
+    stockout_rate: float,
+) -> dict:
+    """simulate_many's summary dict (evaluate_grid_vec returns the same fields as columns)."""
+    return {
+        "Q": Q,
+        "n games": n,
+        "seed": seed,
+        "avg_profit": float(avg_profit),
+        "sd_profit": float(sd_profit),
+        "min_profit": float(min_profit),
+        "max_profit": float(max_profit),
+        "avg_attendance": float(avg_attendance),
+        "avg_demand": float(avg_demand),
+        "avg_sold": float(avg_sold),
+        "avg_leftover": Q - float(avg_sold),
+        "stockout_rate": float(stockout_rate),
+        "price": sc.price,
+        "cost": sc.cost,
+        "salvage": sc.salvage,
+        "fixed_cost_per_game": fixed,
+    }
+
+
+# games per independently seeded block of the demand stream
+_DRAW_BLOCK = 2048
+
+
+@lru_cache(maxsize=512)
+def _draw_block(params: tuple[float, float, float], seed: int, b: int) -> tuple[np.ndarray, ...]:
+    """
+    Block b of the demand stream for the given attendance params and seed.
+
+    Each block has its own generator, seeded with child b of SeedSequence(seed)
+    (what SeedSequence(seed).spawn would hand out), so block b is the same
+    whatever the run length. Blocks are cached and shared, so they are read-only.
+    """
+    out = game.sample_demand_from_params(game.make_rng(seed, b), params, _DRAW_BLOCK)
+    for arr in out:
+        arr.flags.writeable = False
+    return out
+
+
+@lru_cache(maxsize=8)
+def _draw_demand(
+    params: tuple[float, float, float], n: int, seed: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Draw n games from the demand model for game.attendance_params(sc).
+
+    Returns (D, attendance, eps) arrays, assembled from fixed-size, separately
+    seeded blocks (see _draw_block), so the first n games are the same for any
+    run of n or more games: raising the replication count only draws the new
+    blocks, and changing economics reuses every block.
+
+    The assembled sample is memoized too: a grid run, its best/runner-up traces
+    and a refine pass all reuse one draw, and it is keyed on the attendance params
+    like the blocks, so scenarios that differ only in economics share it. It is
+    shared, so it is read-only.
+    """
+    blocks = [_draw_block(params, seed, b) for b in range(-(-n // _DRAW_BLOCK))]
+
+    D, a, eps = (np.concatenate([blk[k] for blk in blocks])[:n] for k in range(3))
+
+    for arr in (D, a, eps):
+        arr.flags.writeable = False
+
+    return D, a, eps
+
+
 def simulate_many(
     Q: int,
     sc: Scenario,
@@ -23,6 +106,11 @@ def simulate_many(
     - n defaults to sc.replications
     - seed defaults to sc.seed
     - return_traces=True includes per-game series for plotting, including epsilon
+      (int32 demand/attendance, float32 profit/eps ndarrays)
+
+    Demand is drawn once up front; the summary is then a single fused stats
+    kernel call (numba-compiled when numba is installed, NumPy otherwise), and
+    per-game profits are only materialized when traces are requested.
     """
     sc.validate()
 
@@ -34,61 +122,127 @@ def simulate_many(
     if Q < 0:
         raise ValueError("Q must be >= 0")
 
-    rng = random.Random(seed)
+    p, c, s, fixed = game.economics(sc)
 
-    profits = []
-    demands = []
-    solds = []
-    leftovers = []
-    attendances = []
-    epsilons = []
-    stockouts = 0
+    D, attendances, epsilons = _draw_demand(game.attendance_params(sc), n, seed)
 
-    for _ in range(n):
-        D, a, eps = game.sample_demand(rng, sc)
-        res = game.profit_for_game(Q, D, a, sc)
+    avg, sd, lo, hi, avg_sold, stockout = kernels.profit_stats(Q, D, p, c, s, fixed)
 
-        profits.append(res.profit)
-        demands.append(res.D)
-        solds.append(res.sold)
-        leftovers.append(res.leftover)
-        attendances.append(res.attendance)
-        epsilons.append(eps)
+    out = _summary_row(
+        Q, n, seed, sc, fixed,
+        avg_profit=avg,
+        sd_profit=sd,
+        min_profit=lo,
+        max_profit=hi,
+        avg_attendance=attendances.mean(),
+        avg_demand=D.mean(),
+        avg_sold=avg_sold,
+        stockout_rate=stockout,
+    )
 
-        if res.D > Q:
-            stockouts += 1
+    if return_traces:
+        out["traces"] = game_traces(Q, sc, n=n, seed=seed)
 
-    out = {
-        "Q": Q,
-        "n games": n,
-        "seed": seed,
-        "avg_profit": mean(profits),
-        "sd_profit": pstdev(profits),
-        "min_profit": min(profits),
-        "max_profit": max(profits),
-        "avg_attendance": mean(attendances),
-        "avg_demand": mean(demands),
-        "avg_sold": mean(solds),
-        "avg_leftover": mean(leftovers),
-        "stockout_rate": stockouts / n,
+    return out
+
+
+def game_traces(Q: int, sc: Scenario, n: int | None = None, seed: int | None = None) -> dict:
+    """
+    Per-game series at Q (profit, demand, attendance, eps) from the memoized sample.
+
+    Used for simulate_many's traces, and directly by callers that already have the
+    summary row for Q (e.g. the best Q of an evaluate_grid_vec run) so nothing is
+    re-scored. Counts fit int32 and float32 is plenty for plotting.
+    """
+    n = sc.replications if n is None else n
+    seed = sc.seed if seed is None else seed
+
+    p, c, s, fixed = game.economics(sc)
+    D, attendances, epsilons = _draw_demand(game.attendance_params(sc), n, seed)
+
+    return {
+        "profit": kernels.profit_kernel(Q, D, p, c, s, fixed).astype(np.float32),
+        "demand": D.astype(np.int32),
+        "attendance": attendances.astype(np.int32),
+        "eps": epsilons.astype(np.float32),
     }
 
-    out.update({
-    "price": sc.price,
-    "cost": sc.cost,
-    "salvage": sc.salvage,
-    "fixed_cost_per_game": getattr(sc, "fixed_cost_per_game", getattr(config, "FIXED_COST_PER_GAME", 0.0)),
-    })
 
-    if return_traces:
-        out["traces"] = {
-            "profit": profits,
-            "demand": demands,
-            "attendance": attendances,
-            "eps": epsilons,
-        }
+def evaluate_grid_vec(
+    Q_values: Iterable[int],
+    sc: Scenario,
+    n: int | None = None,
+    seed: int | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Evaluate multiple Q values under the same Scenario, column-wise.
+
+    Returns one array per summary field (the same keys simulate_many reports),
+    each aligned with Q_values, so callers can rank with argmax/argpartition
+    instead of scanning a list of dicts.
+
+    Demand does not depend on Q, so the sample is drawn once and every Q is
+    scored against it (common random numbers): differences between Q values
+    come from Q alone, not from resampling noise, which keeps the profit-vs-Q
+    curve smooth. Rows match what simulate_many gives for the same Q and seed,
+    and game_traces reuses the memoized sample for best-Q traces.
+    Q values are scored in parallel by the numba kernel when available.
+    """
+    sc.validate()
 
-    return out
+    n = sc.replications if n is None else n
+    seed = sc.seed if seed is None else seed
+
+    if n <= 0:
+        raise ValueError("n/replications must be > 0")
+
+    # arrays, lists and ranges convert directly; other iterables are materialized first
+    qs = np.asarray(Q_values if hasattr(Q_values, "__len__") else list(Q_values), dtype=np.int32)
+    if qs.size and qs.min() < 0:
+        raise ValueError("Q must be >= 0")
+
+    p, c, s, fixed = game.economics(sc)
+    D, attendances, _ = _draw_demand(game.attendance_params(sc), n, seed)
+
+    avg, sd, lo, hi, avg_sold, stockout = kernels.grid_kernel(qs, D, p, c, s, fixed)
+
+    G = qs.size
+    return {
+        "Q": qs,
+        "n games": np.full(G, n),
+        "seed": np.full(G, seed),
+        "avg_profit": avg,
+        "sd_profit": sd,
+        "min_profit": lo,
+        "max_profit": hi,
+        "avg_attendance": np.full(G, attendances.mean()),
+        "avg_demand": np.full(G, D.mean()),
+        "avg_sold": avg_sold,
+        "avg_leftover": qs - avg_sold,
+        "stockout_rate": stockout,
+        "price": np.full(G, sc.price),
+        "cost": np.full(G, sc.cost),
+        "salvage": np.full(G, sc.salvage),
+        "fixed_cost_per_game": np.full(G, fixed),
+    }
+
+
+def grid_row(grid: dict[str, np.ndarray], i: int) -> dict:
+    """Row i of an evaluate_grid_vec result as a plain summary dict."""
+    return {k: v[i].item() for k, v in grid.items()}
+
+
+def top_indices(values: np.ndarray, k: int = 10) -> np.ndarray:
+    """
+    Indices of the k largest values, largest first.
+
+    argpartition finds the k in O(n); only those k are then sorted.
+    """
+    k = min(k, values.size)
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    idx = np.argpartition(-values, k - 1)[:k]
+    return idx[np.argsort(-values[idx], kind="stable")]
 
 
 def evaluate_grid(
@@ -99,8 +253,11 @@ def evaluate_grid(
 ) -> list[dict]:
     """
     Evaluate multiple Q values under the same Scenario.
+
+    Row-per-Q form of evaluate_grid_vec: one summary dict per Q value.
     """
-    return [simulate_many(Q=Q, sc=sc, n=n, seed=seed) for Q in Q_values]
+    grid = evaluate_grid_vec(Q_values, sc, n=n, seed=seed)
+    return [grid_row(grid, i) for i in range(grid["Q"].size)]
 
 
 def print_summary(summary: dict) -> None:
@@ -157,6 +314,7 @@ def main() -> None:
     # Scenario / simulation controls
     parser.add_argument("--seed", type=int, default=None, help="Random seed.")
     parser.add_argument("--n", type=int, default=None, help="Number of replications (simulated games).")
+    parser.add_argument("--workers", type=int, default=None, help="Threads for the grid kernels (default: all cores).")
 
     parser.add_argument("--capacity", type=int, default=None, help="Stadium capacity.")
     parser.add_argument("--temp", type=float, default=None, help="Temperature (F).")
@@ -185,6 +343,9 @@ def main() -> None:
 
     args = parser.parse_args()
 
+    if args.workers is not None:
+        kernels.set_workers(args.workers)
+
     sc = build_scenario_from_args(args)
     sc.validate()
 
@@ -200,19 +361,20 @@ def main() -> None:
     if args.Qmax < args.Qmin:
         raise ValueError("--Qmax must be >= --Qmin")
 
-    Q_values = list(range(args.Qmin, args.Qmax + 1, args.step))
-    results = evaluate_grid(Q_values, sc=sc)
-
-    best = max(results, key=lambda r: r["avg_profit"])
+    # Columnar results: rank with argmax/argpartition, build dicts only for printed rows
+    Q_values = np.arange(args.Qmin, args.Qmax + 1, args.step, dtype=np.int32)
+    grid = evaluate_grid_vec(Q_values, sc=sc)
+    avg_profit = grid["avg_profit"]
 
     print("\n=== Grid Search Results (top 10 by avg_profit) ===")
-    top10 = sorted(results, key=lambda r: r["avg_profit"], reverse=True)[:10]
-    for r in top10:
+    for i in top_indices(avg_profit, 10):
         print(
-            f"Q={r['Q']:>6} | avg_profit={r['avg_profit']:>10.2f} | "
-            f"stockout_rate={r['stockout_rate']:.3f} | avg_leftover={r['avg_leftover']:.1f}"
+            f"Q={int(grid['Q'][i]):>6} | avg_profit={avg_profit[i]:>10.2f} | "
+            f"stockout_rate={grid['stockout_rate'][i]:.3f} | avg_leftover={grid['avg_leftover'][i]:.1f}"
         )
 
+    best = grid_row(grid, int(np.argmax(avg_profit)))
+
     print("\n=== Best Q by avg_profit (coarse grid) ===")
     print_summary(best)
 
@@ -226,9 +388,9 @@ def main() -> None:
         q_lo = max(args.Qmin, q_center - args.refine_width)
         q_hi = min(args.Qmax, q_center + args.refine_width)
 
-        refined_Qs = list(range(q_lo, q_hi + 1, args.refine_step))
-        refined_results = evaluate_grid(refined_Qs, sc=sc)
-        best_refined = max(refined_results, key=lambda r: r["avg_profit"])
+        refined_Qs = np.arange(q_lo, q_hi + 1, args.refine_step, dtype=np.int32)
+        refined = evaluate_grid_vec(refined_Qs, sc=sc)
+        best_refined = grid_row(refined, int(np.argmax(refined["avg_profit"])))
 
         print(f"\n=== Refined Search (best+/-{args.refine_width} by {args.refine_step}) ===")
         print_summary(best_refined)
@@ -39,6 +39,9 @@ class Scenario:
     playoff: bool = False
 
     def validate(self) -> None:
+        """
+        Raise ValueError if any input is out of range (bounds are read from config).
+        """
         # -------------------------
         # Simulation controls
         # -------------------------